@@ -10,6 +10,7 @@ Modules:
     models      - ORM model definitions (Vendor entity)
     schemas     - Pydantic request/response validation schemas
     crud        - Database CRUD operations
+    admission   - Concurrency limits, rate limiting and query coalescing
     seed        - Database seeding utilities
     routers/    - API endpoint definitions
 
@@ -0,0 +1,282 @@
+"""
+Admission Control & Load Shedding
+=================================
+Guards expensive vendor endpoints so a burst of search traffic cannot
+starve cheap requests (e.g. /health) of threadpool workers or DB connections.
+
+Components:
+    ConcurrencyLimiter - Per-route concurrency cap with a bounded wait queue.
+                         Waiting happens on the event loop, not in a worker
+                         thread, and overflow is rejected fast with 503.
+    SearchRateLimiter  - Per-client token bucket applied to search requests.
+                         Exhausted buckets are rejected with 429.
+    QueryCoalescer     - Single-flight helper: identical in-flight queries
+                         share one execution and its result. Sits in front
+                         of the limiter, so only the leader takes a slot.
+
+All rejections carry a Retry-After header so well-behaved clients back off.
+
+Environment Variables (all optional):
+    VENDORS_LIST_MAX_CONCURRENCY   - Concurrent list/search queries (default: 4)
+    VENDORS_LIST_MAX_QUEUE         - Requests allowed to wait for a slot (default: 16)
+    VENDORS_CREATE_MAX_CONCURRENCY - Concurrent vendor creates (default: 4)
+    VENDORS_CREATE_MAX_QUEUE       - Creates allowed to wait for a slot (default: 8)
+    ADMISSION_QUEUE_TIMEOUT        - Max seconds spent waiting for a slot (default: 5)
+    SEARCH_RATE_PER_SECOND         - Token refill rate per client (default: 5)
+    SEARCH_RATE_BURST              - Token bucket capacity per client (default: 10)
+    SEARCH_RATE_CLIENT_HEADER      - Header identifying the client for rate
+                                     limiting, e.g. X-Forwarded-For (default:
+                                     unset, use the socket peer address)
+
+Note: by default search buckets are keyed on the peer address. Behind a
+reverse proxy or load balancer that is the proxy itself, so all users would
+share one bucket. Set SEARCH_RATE_CLIENT_HEADER to the forwarding header your
+proxy sets; its last (rightmost) entry is used, which is the address the
+nearest trusted proxy saw. Only enable it when a proxy always sets the
+header, otherwise clients can spoof their identity.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, Request, status
+
+T = TypeVar("T")
+
+# Default cap on tracked clients; least recently seen buckets are dropped first
+MAX_TRACKED_CLIENTS = 10_000
+
+
+def _service_unavailable(detail: str, retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+class ConcurrencyLimiter:
+    """
+    Limits how many requests run a route (or a unit of work) at once.
+
+    Requests beyond `max_concurrent` wait in a queue of at most `max_queue`
+    entries. When the queue is full, or a slot does not free up within
+    `queue_timeout` seconds, the request is shed with 503 + Retry-After.
+
+    Usage as a dependency:
+        limiter = ConcurrencyLimiter("vendors.create", max_concurrent=4, max_queue=8)
+
+        @router.post("", dependencies=[Depends(limiter)])
+        def create_vendor(...): ...
+
+    Usage around a unit of work:
+        async with limiter.slot():
+            ...
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float = 5.0,
+        retry_after: int = 1,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+
+        self.name = name
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+
+    def _reject(self) -> HTTPException:
+        return _service_unavailable(
+            f"Server busy ({self.name}), please retry shortly", self.retry_after
+        )
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked():
+            # All slots taken: queue up, or shed load if the queue is full
+            if self._waiting >= self.max_queue:
+                raise self._reject()
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._semaphore.acquire(), timeout=self.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                raise self._reject()
+            finally:
+                self._waiting -= 1
+        else:
+            # Fast path: a slot is free, no queueing needed
+            await self._semaphore.acquire()
+
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    async def __call__(self):
+        async with self.slot():
+            yield
+
+
+class SearchRateLimiter:
+    """
+    Async dependency enforcing a per-client token bucket on search requests.
+
+    Each client gets `burst` tokens that refill at `rate` tokens/second.
+    Clients are keyed by peer address, or by the last entry of
+    `client_header` when set (see module notes on reverse proxies). Requests without a `search` term are not charged.
+    At most `max_clients` buckets are kept; the least recently seen client
+    is forgotten first. Runs on the event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_clients: int = MAX_TRACKED_CLIENTS,
+        client_header: Optional[str] = None,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if max_clients < 1:
+            raise ValueError("max_clients must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.client_header = client_header
+        # client key -> (tokens, last refill timestamp), in LRU order
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def __call__(self, request: Request, search: Optional[str] = None):
+        if not search:
+            return
+
+        client = self._client_key(request)
+        now = time.monotonic()
+
+        tokens, last = self._buckets.pop(client, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+        if tokens < 1:
+            self._store(client, tokens, now)
+            retry_after = math.ceil((1 - tokens) / self.rate)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many search requests, please slow down",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        self._store(client, tokens - 1, now)
+
+    def _client_key(self, request: Request) -> str:
+        if self.client_header:
+            forwarded = request.headers.get(self.client_header, "")
+            entries = [entry.strip() for entry in forwarded.split(",") if entry.strip()]
+            if entries:
+                return entries[-1]
+        return request.client.host if request.client else "unknown"
+
+    def _store(self, client: str, tokens: float, now: float) -> None:
+        self._buckets[client] = (tokens, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+
+class QueryCoalescer:
+    """
+    Single-flight execution for identical in-flight queries.
+
+    The first caller for a key (the leader) runs `fn`; callers arriving with
+    the same key while it is running await the leader's result on the event
+    loop, holding neither a concurrency slot nor a worker thread. Errors are
+    propagated to every waiter. `fn` should return plain data (not ORM
+    instances), since the result is shared across requests.
+
+    Followers wait as long as the leader does; bound the leader's work
+    (e.g. with a ConcurrencyLimiter queue timeout) rather than the followers.
+    """
+
+    def __init__(self, retry_after: int = 1):
+        self.retry_after = retry_after
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is not None:
+            return await self._follow(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a leader without followers logs nothing
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # Unregister so later callers start a fresh query
+            self._inflight.pop(key, None)
+
+    async def _follow(self, future: asyncio.Future):
+        try:
+            # Shield so a disconnecting follower can't cancel the shared query
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            # The leader was cancelled; this request itself is still live
+            raise _service_unavailable(
+                "Query was interrupted, please retry shortly", self.retry_after
+            )
+
+
+# Shared instances for the vendors router, configured from the environment
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))
+
+vendors_list_limiter = ConcurrencyLimiter(
+    "vendors.list",
+    max_concurrent=int(os.getenv("VENDORS_LIST_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("VENDORS_LIST_MAX_QUEUE", "16")),
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+)
+
+vendors_create_limiter = ConcurrencyLimiter(
+    "vendors.create",
+    max_concurrent=int(os.getenv("VENDORS_CREATE_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("VENDORS_CREATE_MAX_QUEUE", "8")),
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+)
+
+search_rate_limiter = SearchRateLimiter(
+    rate=float(os.getenv("SEARCH_RATE_PER_SECOND", "5")),
+    burst=int(os.getenv("SEARCH_RATE_BURST", "10")),
+    client_header=os.getenv("SEARCH_RATE_CLIENT_HEADER") or None,
+)
+
+vendor_query_coalescer = QueryCoalescer()
@@ -4,6 +4,9 @@ Separated from routing to keep logic testable.
 """
 
 import uuid
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import asc, desc
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -45,3 +48,51 @@ def create_vendor(db: Session, payload: VendorCreate) -> Vendor:
     except SQLAlchemyError as exc:
         db.rollback()
         raise RuntimeError("Database error while creating vendor") from exc
+
+
+# Whitelist of allowed sort columns to prevent SQL injection
+# Maps query param values to actual SQLAlchemy column objects
+ALLOWED_SORTS = {
+    "name": Vendor.name,
+    "spend_365d": Vendor.spend_365d,
+    "spend_30d": Vendor.spend_30d,
+    "created_at": Vendor.created_at,
+}
+
+
+def resolve_sort(sort_by: Optional[str], sort_order: Optional[str]) -> tuple[str, str]:
+    """
+    Normalizes sort params to the column name and direction actually used.
+    Unknown columns fall back to created_at; anything but 'asc' sorts desc.
+    """
+    column = sort_by if sort_by in ALLOWED_SORTS else "created_at"
+    direction = "asc" if sort_order == "asc" else "desc"
+    return column, direction
+
+
+def get_vendors(
+    db: Session,
+    search: Optional[str],
+    sort_by: str,
+    sort_order: str,
+) -> List[Dict[str, Any]]:
+    """
+    Lists vendors matching `search`, ordered by an already-resolved sort.
+    Returns plain dicts so results can be shared beyond the session.
+    """
+    query = db.query(Vendor)
+
+    # Apply search filter if provided (case-insensitive LIKE query)
+    if search:
+        query = query.filter(Vendor.name.ilike(f"%{search}%"))
+
+    sort_column = ALLOWED_SORTS[sort_by]
+    query = query.order_by(
+        asc(sort_column) if sort_order == "asc" else desc(sort_column)
+    )
+
+    columns = [column.key for column in Vendor.__table__.columns]
+    return [
+        {key: getattr(vendor, key) for key in columns}
+        for vendor in query.all()
+    ]
@@ -6,22 +6,31 @@ searching, sorting, and CRUD operations.
 
 Endpoints:
     GET /vendors - List all vendors with optional search/sort
+    POST /vendors - Create new vendor
+
+Both endpoints sit behind admission control (see app/admission.py):
+per-route concurrency limits with a bounded wait queue, per-client
+rate limiting on search, and coalescing of identical in-flight listings.
 
 TODO:
-    - POST /vendors - Create new vendor
     - GET /vendors/{id} - Get vendor by ID
     - PUT /vendors/{id} - Update vendor
     - DELETE /vendors/{id} - Delete vendor
 """
 
 from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from app.schemas import VendorCreate, VendorCreateResponse
-from app.crud import create_vendor
+from app.crud import create_vendor, get_vendors, resolve_sort
+from app.admission import (
+    search_rate_limiter,
+    vendor_query_coalescer,
+    vendors_create_limiter,
+    vendors_list_limiter,
+)
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
 from typing import Optional
 from ..database import SessionLocal
-from ..models import Vendor
 
 # Create router with URL prefix and OpenAPI tag grouping
 router = APIRouter(prefix="/vendors", tags=["vendors"])
@@ -45,12 +54,25 @@ def get_db():
         db.close()
 
 
-@router.get("")
-def list_vendors(
+def _fetch_vendors(search: Optional[str], sort_by: str, sort_order: str):
+    """
+    Runs the vendor listing query in its own session.
+
+    Called from the threadpool by the single-flight leader only, so the
+    session never crosses threads and followers never open one.
+    """
+    db = SessionLocal()
+    try:
+        return get_vendors(db, search, sort_by, sort_order)
+    finally:
+        db.close()
+
+
+@router.get("", dependencies=[Depends(search_rate_limiter)])
+async def list_vendors(
     search: Optional[str] = None,
     sort_by: Optional[str] = "created_at",
     sort_order: Optional[str] = "desc",
-    db: Session = Depends(get_db),
 ):
     """
     Retrieve a list of vendors with optional filtering and sorting.
@@ -59,44 +81,37 @@ def list_vendors(
         search: Case-insensitive partial match on vendor name
         sort_by: Column to sort by (name, spend_365d, spend_30d, created_at)
         sort_order: Sort direction - 'asc' or 'desc' (default: desc)
-        db: Database session (injected)
     
     Returns:
-        List[Vendor]: Array of vendor objects matching the criteria
+        List[dict]: Array of vendor objects matching the criteria
+    
+    Raises:
+        HTTPException 429: Client exceeded the search rate limit
+        HTTPException 503: Too many listings in flight and wait queue is full
     
     Example:
         GET /vendors?search=acme&sort_by=spend_365d&sort_order=desc
     """
-    # Start with base query
-    query = db.query(Vendor)
-
-    # Apply search filter if provided (case-insensitive LIKE query)
-    if search:
-        query = query.filter(Vendor.name.ilike(f"%{search}%"))
-
-    # Whitelist of allowed sort columns to prevent SQL injection
-    # Maps query param values to actual SQLAlchemy column objects
-    allowed_sorts = {
-        "name": Vendor.name,
-        "spend_365d": Vendor.spend_365d,
-        "spend_30d": Vendor.spend_30d,
-        "created_at": Vendor.created_at,
-    }
+    # Key on what the query actually runs, so invalid params can't bypass it
+    sort_by, sort_order = resolve_sort(sort_by, sort_order)
+    coalesce_key = (search or "", sort_by, sort_order)
 
-    # Fallback to created_at if invalid sort_by is provided
-    sort_column = allowed_sorts.get(sort_by, Vendor.created_at)
+    async def run_query():
+        # Only the single-flight leader takes a concurrency slot
+        async with vendors_list_limiter.slot():
+            return await run_in_threadpool(
+                _fetch_vendors, search, sort_by, sort_order
+            )
 
-    # Apply sort order (ascending or descending)
-    query = query.order_by(
-        asc(sort_column) if sort_order == "asc" else desc(sort_column)
-    )
+    # Identical concurrent listings share a single SQL execution
+    return await vendor_query_coalescer.run(coalesce_key, run_query)
 
-    return query.all()
 
 @router.post(
     "",
     response_model=VendorCreateResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(vendors_create_limiter)],
 )
 def create_vendor_endpoint(
     payload: VendorCreate,
@@ -0,0 +1,8 @@
+"""
+Shared test setup. Points the app at an in-memory SQLite URL so importing
+the routers never needs Postgres; tests stub out the actual queries.
+"""
+
+import os
+
+os.environ["DATABASE_URL"] = "sqlite://"
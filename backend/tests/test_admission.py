@@ -0,0 +1,244 @@
+"""
+Tests for admission control: concurrency limits, search rate limiting
+and single-flight query coalescing. Pure asyncio, no database required.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.admission import ConcurrencyLimiter, QueryCoalescer, SearchRateLimiter
+
+
+def make_request(host: str = "10.0.0.1", forwarded_for: str = None) -> Request:
+    headers = []
+    if forwarded_for is not None:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    return Request({"type": "http", "client": (host, 1234), "headers": headers})
+
+
+# --- ConcurrencyLimiter ---
+
+
+def test_limiter_sheds_with_503_when_queue_full():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=0, retry_after=2)
+        async with limiter.slot():
+            with pytest.raises(HTTPException) as exc_info:
+                async with limiter.slot():
+                    pass
+        return exc_info.value
+
+    exc = asyncio.run(scenario())
+    assert exc.status_code == 503
+    assert exc.headers == {"Retry-After": "2"}
+
+
+def test_limiter_sheds_with_503_after_queue_timeout():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        async with limiter.slot():
+            with pytest.raises(HTTPException) as exc_info:
+                async with limiter.slot():
+                    pass
+        return exc_info.value
+
+    exc = asyncio.run(scenario())
+    assert exc.status_code == 503
+    assert "Retry-After" in exc.headers
+
+
+def test_limiter_queued_request_runs_once_slot_frees():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=1)
+        order = []
+
+        async def worker(name):
+            async with limiter.slot():
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(worker("a"), worker("b"))
+        return order
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+@pytest.mark.parametrize("kwargs", [{"max_concurrent": 0, "max_queue": 1}, {"max_concurrent": 1, "max_queue": -1}])
+def test_limiter_rejects_invalid_config(kwargs):
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter("test", **kwargs)
+
+
+# --- SearchRateLimiter ---
+
+
+def test_rate_limiter_returns_429_with_retry_after():
+    async def scenario():
+        limiter = SearchRateLimiter(rate=0.5, burst=2)
+        request = make_request()
+        await limiter(request, search="acme")
+        await limiter(request, search="acme")
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter(request, search="acme")
+        return exc_info.value
+
+    exc = asyncio.run(scenario())
+    assert exc.status_code == 429
+    assert exc.headers == {"Retry-After": "2"}
+
+
+def test_rate_limiter_ignores_requests_without_search():
+    async def scenario():
+        limiter = SearchRateLimiter(rate=1, burst=1)
+        request = make_request()
+        for _ in range(5):
+            await limiter(request, search=None)
+        await limiter(request, search="acme")
+
+    asyncio.run(scenario())
+
+
+def test_rate_limiter_buckets_are_per_client():
+    async def scenario():
+        limiter = SearchRateLimiter(rate=1, burst=1)
+        await limiter(make_request("10.0.0.1"), search="acme")
+        await limiter(make_request("10.0.0.2"), search="acme")
+
+    asyncio.run(scenario())
+
+
+def test_rate_limiter_keys_on_configured_client_header():
+    async def scenario():
+        limiter = SearchRateLimiter(rate=1, burst=1, client_header="X-Forwarded-For")
+        # Same proxy address, different forwarded clients
+        await limiter(make_request("10.0.0.9", "1.1.1.1, 203.0.113.1"), search="x")
+        await limiter(make_request("10.0.0.9", "203.0.113.2"), search="x")
+        with pytest.raises(HTTPException):
+            await limiter(make_request("10.0.0.9", "9.9.9.9, 203.0.113.1"), search="x")
+        # Missing header falls back to the peer address
+        await limiter(make_request("10.0.0.9"), search="x")
+
+    asyncio.run(scenario())
+
+
+def test_rate_limiter_caps_tracked_clients_lru():
+    async def scenario():
+        limiter = SearchRateLimiter(rate=1, burst=5, max_clients=3)
+        for host in ["a", "b", "c"]:
+            await limiter(make_request(host), search="x")
+        # Touch "a" so "b" becomes least recently seen
+        await limiter(make_request("a"), search="x")
+        await limiter(make_request("d"), search="x")
+        return list(limiter._buckets)
+
+    assert asyncio.run(scenario()) == ["c", "a", "d"]
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0, "burst": 1}, {"rate": -1, "burst": 1}, {"rate": 1, "burst": 0}])
+def test_rate_limiter_rejects_invalid_config(kwargs):
+    with pytest.raises(ValueError):
+        SearchRateLimiter(**kwargs)
+
+
+# --- QueryCoalescer ---
+
+
+def test_identical_requests_execute_query_once():
+    async def scenario():
+        coalescer = QueryCoalescer()
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=0)
+        calls = []
+
+        async def run_query():
+            # Would 503 any second caller that tried to take the only slot
+            async with limiter.slot():
+                calls.append(1)
+                await asyncio.sleep(0.05)
+                return [{"name": "Acme"}]
+
+        results = await asyncio.gather(
+            *(coalescer.run(("acme", "created_at", "desc"), run_query) for _ in range(10))
+        )
+        return calls, results
+
+    calls, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == [[{"name": "Acme"}]] * 10
+
+
+def test_different_keys_are_not_coalesced():
+    async def scenario():
+        coalescer = QueryCoalescer()
+        calls = []
+
+        async def run_query():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(coalescer.run("a", run_query), coalescer.run("b", run_query))
+        return calls
+
+    assert len(asyncio.run(scenario())) == 2
+
+
+def test_leader_error_propagates_to_followers():
+    async def scenario():
+        coalescer = QueryCoalescer()
+
+        async def run_query():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        return await asyncio.gather(
+            *(coalescer.run("k", run_query) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_followers_share_result_when_leader_queues_for_a_slot():
+    async def scenario():
+        coalescer = QueryCoalescer()
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=1)
+        calls = []
+
+        async def hold_slot():
+            async with limiter.slot():
+                await asyncio.sleep(0.2)
+
+        async def run_query():
+            # Leader waits behind the held slot before running
+            async with limiter.slot():
+                calls.append(1)
+                await asyncio.sleep(0.1)
+                return "ok"
+
+        holder = asyncio.create_task(hold_slot())
+        await asyncio.sleep(0)
+        results = await asyncio.gather(*(coalescer.run("k", run_query) for _ in range(6)))
+        await holder
+        return calls, results
+
+    calls, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == ["ok"] * 6
+
+
+def test_completed_query_is_not_reused():
+    async def scenario():
+        coalescer = QueryCoalescer()
+        calls = []
+
+        async def run_query():
+            calls.append(1)
+            return len(calls)
+
+        first = await coalescer.run("k", run_query)
+        second = await coalescer.run("k", run_query)
+        return first, second
+
+    assert asyncio.run(scenario()) == (1, 2)
@@ -0,0 +1,98 @@
+"""
+Router-level tests for admission control on /vendors. Queries and DB
+sessions are stubbed, so no database is required.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.admission import (
+    ConcurrencyLimiter,
+    QueryCoalescer,
+    search_rate_limiter,
+    vendors_create_limiter,
+)
+from app.routers import vendors
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # Fresh admission state per test so tests can't leak into each other
+    monkeypatch.setattr(vendors, "vendor_query_coalescer", QueryCoalescer())
+    monkeypatch.setattr(search_rate_limiter, "_buckets", OrderedDict())
+
+    app = FastAPI()
+    app.include_router(vendors.router)
+    return app
+
+
+@pytest.fixture
+def fetch_calls(monkeypatch):
+    calls = []
+
+    def fake_fetch(search, sort_by, sort_order):
+        calls.append((search, sort_by, sort_order))
+        time.sleep(0.2)
+        return [{"name": "Acme"}]
+
+    monkeypatch.setattr(vendors, "_fetch_vendors", fake_fetch)
+    return calls
+
+
+def run_concurrently(app, params_list):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/vendors", params=p) for p in params_list))
+
+    return asyncio.run(scenario())
+
+
+def test_list_resolves_sort_params(app, fetch_calls):
+    response = TestClient(app).get("/vendors", params={"sort_by": "bogus", "sort_order": "up"})
+
+    assert response.status_code == 200
+    assert fetch_calls == [(None, "created_at", "desc")]
+
+
+def test_identical_listings_run_once_and_only_leader_takes_a_slot(app, fetch_calls, monkeypatch):
+    # One slot, no queue: any follower that tried to take a slot would get 503
+    monkeypatch.setattr(vendors, "vendors_list_limiter", ConcurrencyLimiter("test", 1, 0))
+
+    # Unknown sort_by values all resolve to the same query
+    responses = run_concurrently(app, [{"search": "acme", "sort_by": f"x{i}"} for i in range(8)])
+
+    assert [r.status_code for r in responses] == [200] * 8
+    assert all(r.json() == [{"name": "Acme"}] for r in responses)
+    assert fetch_calls == [("acme", "created_at", "desc")]
+
+
+def test_search_is_rate_limited(app, fetch_calls, monkeypatch):
+    monkeypatch.setattr(search_rate_limiter, "burst", 1)
+    monkeypatch.setattr(search_rate_limiter, "rate", 0.1)
+    client = TestClient(app)
+
+    assert client.get("/vendors", params={"search": "acme"}).status_code == 200
+    response = client.get("/vendors", params={"search": "acme"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    # Listings without a search term are not charged
+    assert client.get("/vendors").status_code == 200
+
+
+def test_create_sheds_with_503_when_limiter_full(app, monkeypatch):
+    # Zero free slots and no queue: the limiter is full
+    monkeypatch.setattr(vendors_create_limiter, "_semaphore", asyncio.Semaphore(0))
+    monkeypatch.setattr(vendors_create_limiter, "max_queue", 0)
+    app.dependency_overrides[vendors.get_db] = lambda: None
+
+    response = TestClient(app).post("/vendors", json={"name": "Acme", "payment_type": "Card"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"